@@ -11,13 +11,24 @@ Structure follows Flask best practices:
 - Settings management via JSON file
 """
 from flask import Flask, render_template, jsonify, request, abort
+from flask.json.provider import DefaultJSONProvider
 import os
 import re
 import json
+import hashlib
+import stat
 import logging
+import threading
 from datetime import date
+from pathlib import Path
 
-from jinja2 import Environment, BaseLoader, StrictUndefined, TemplateError
+from jinja2 import Environment, FunctionLoader, StrictUndefined, TemplateError
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; Flask's stdlib-based JSON provider is used without it
+    orjson = None
 
 # Flask app initialization
 # Use instance folder for user-specific configuration (Flask best practice)
@@ -45,45 +56,96 @@ if INSTANCE_DIR is None:
 
 SETTINGS_FILE = os.path.join(INSTANCE_DIR, "settings.json")
 
+# Request size limits: /api/render refuses template text over the per-template
+# cap before Jinja lexes it, and rendered output over the output cap. Flask
+# rejects request bodies over MAX_CONTENT_LENGTH with 413 before parsing them;
+# it is sized so any preview /api/render returns can be sent back to /api/save
+# (JSON escapes a character to at most 6 bytes, e.g. \u001b).
+MAX_RENDER_TEMPLATE_LENGTH = 256 * 1024
+MAX_RENDER_OUTPUT_LENGTH = 256 * 1024
+app.config["MAX_CONTENT_LENGTH"] = 6 * MAX_RENDER_OUTPUT_LENGTH + 64 * 1024
+
 # ============================================================================
 # Logging Setup
 # ============================================================================
 
+
+def parse_log_level(value):
+    """Return a logging level for a name or number, or None if it isn't valid."""
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else None
+
+
 # Basic, light logging setup – logs go to stdout/stderr which Passenger captures.
+# Per-request success messages are logged at DEBUG; set LOG_LEVEL=DEBUG to see them.
+LOG_LEVEL_SETTING = os.environ.get("LOG_LEVEL", "INFO")
+LOG_LEVEL = parse_log_level(LOG_LEVEL_SETTING)
 if not logging.getLogger().handlers:
     logging.basicConfig(
-        level=logging.INFO,
+        level=LOG_LEVEL if LOG_LEVEL is not None else logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
 logger = logging.getLogger(__name__)
 
-# File logging to logs/app-YYYY-MM-DD.log (a new file for each day the app starts)
-try:
-    if not os.path.isdir(LOG_DIR):
-        os.makedirs(LOG_DIR)
-    log_file_path = os.path.join(LOG_DIR, "app-%s.log" % date.today().isoformat())
-    file_handler = logging.FileHandler(log_file_path)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(
-        logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-    )
-    logger.addHandler(file_handler)
-except Exception:
-    # If file logging fails for any reason, continue with stdout/stderr logging only.
-    logger.warning("File logging could not be initialized; continuing without app-YYYY-MM-DD.log")
+if LOG_LEVEL is None:
+    logger.warning("Invalid LOG_LEVEL %r; using INFO", LOG_LEVEL_SETTING)
+
+# File logging to logs/app-YYYY-MM-DD.log (a new file for each day the app starts).
+# Set up on the first request rather than at import, so scripts and tools that
+# only import the module don't create the log directory or open a log file.
+_FILE_LOGGING = {"initialized": False}
+_FILE_LOGGING_LOCK = threading.Lock()
+
+
+def init_file_logging():
+    """Attach the daily log file handler to the app logger (once per process)."""
+    if _FILE_LOGGING["initialized"]:
+        return
+    with _FILE_LOGGING_LOCK:
+        if _FILE_LOGGING["initialized"]:
+            return
+        _FILE_LOGGING["initialized"] = True
+        try:
+            os.makedirs(LOG_DIR, exist_ok=True)
+            log_file_path = os.path.join(LOG_DIR, "app-%s.log" % date.today().isoformat())
+            file_handler = logging.FileHandler(log_file_path)
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(
+                logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+            )
+            logger.addHandler(file_handler)
+        except Exception:
+            # If file logging fails for any reason, continue with stdout/stderr logging only.
+            logger.warning("File logging could not be initialized; continuing without app-YYYY-MM-DD.log")
+
+
+@app.before_request
+def ensure_file_logging():
+    """Initialize file logging before the first request is handled."""
+    init_file_logging()
 
 # ============================================================================
 # Settings Management
 # ============================================================================
 
 
+# Parsed settings keyed on the settings file's (mtime_ns, size) so requests
+# only re-read settings.json after it changes on disk.
+_SETTINGS_CACHE = {"key": None, "value": None}
+_SETTINGS_LOCK = threading.Lock()
+
+
 def load_settings():
     """
     Load user settings from instance folder (Flask best practice).
     
     Returns dict with default values if file doesn't exist or can't be read.
     Uses JSON format (Python standard library, no extra dependencies).
+    The parsed file is cached until its modification time or size changes.
     """
     defaults = {
         "additional_root": "",
@@ -91,7 +153,19 @@ def load_settings():
         "additional_template_dirs": [],
         "navbar_color": "#e3f2fd",
     }
-    if os.path.isfile(SETTINGS_FILE):
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except FileNotFoundError:
+        return defaults
+    except OSError as e:
+        logger.warning("Failed to load settings file: %s", e)
+        return defaults
+
+    key = (st.st_mtime_ns, st.st_size)
+    with _SETTINGS_LOCK:
+        if _SETTINGS_CACHE["key"] == key:
+            return dict(_SETTINGS_CACHE["value"])
+
         try:
             with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
                 settings = json.load(f)
@@ -99,7 +173,18 @@ def load_settings():
                 defaults.update(settings)
         except (OSError, ValueError) as e:
             logger.warning("Failed to load settings file: %s", e)
-    return defaults
+            return defaults
+
+        _SETTINGS_CACHE["key"] = key
+        _SETTINGS_CACHE["value"] = defaults
+        return dict(defaults)
+
+
+def invalidate_settings_cache():
+    """Drop cached settings so the next load re-reads settings.json."""
+    with _SETTINGS_LOCK:
+        _SETTINGS_CACHE["key"] = None
+        _SETTINGS_CACHE["value"] = None
 
 
 def save_settings(settings):
@@ -119,14 +204,34 @@ def save_settings(settings):
         return False
 
 
+# Computed roots keyed on the inputs that determine them, so directory checks
+# and realpath calls only run when the home, environment, or settings change.
+# Results where a configured root was missing are not cached, so a root on a
+# mount that was briefly unavailable is picked up once it comes back.
+_ROOTS_CACHE = {"key": None, "roots": None}
+_ROOTS_LOCK = threading.Lock()
+
+
 def get_roots():
     """Get list of allowed root directories from settings and environment."""
     HOME_DIR = os.path.expanduser("~")
+    env_root = os.environ.get("TEMPLATE_EDITOR_ROOT")
+    settings = load_settings()
+    additional_root = settings.get("additional_root", "").strip()
+    custom_label = settings.get("additional_root_label", "").strip()
+
+    key = (HOME_DIR, env_root, additional_root, custom_label)
+    with _ROOTS_LOCK:
+        if _ROOTS_CACHE["key"] == key:
+            return _ROOTS_CACHE["roots"]
+
     roots = [{"id": "home", "label": "Home directory", "path": os.path.realpath(HOME_DIR)}]
+    missing_root = False
     
     # Check environment variable first (for backward compatibility)
-    env_root = os.environ.get("TEMPLATE_EDITOR_ROOT")
-    if env_root and os.path.isdir(env_root):
+    if env_root and not os.path.isdir(env_root):
+        missing_root = True
+    elif env_root:
         roots.append({
             "id": "env_root",
             "label": "Environment root",
@@ -134,11 +239,10 @@ def get_roots():
         })
     
     # Check settings file
-    settings = load_settings()
-    additional_root = settings.get("additional_root", "").strip()
-    if additional_root and os.path.isdir(additional_root):
+    if additional_root and not os.path.isdir(additional_root):
+        missing_root = True
+    elif additional_root:
         # Use custom label if provided, otherwise generate a default
-        custom_label = settings.get("additional_root_label", "").strip()
         if not custom_label:
             # Default label based on the directory name
             custom_label = os.path.basename(additional_root.rstrip(os.sep)) or "Additional root"
@@ -147,10 +251,37 @@ def get_roots():
             "label": custom_label,
             "path": os.path.realpath(additional_root),
         })
-    
+
+    if not missing_root:
+        with _ROOTS_LOCK:
+            _ROOTS_CACHE["key"] = key
+            _ROOTS_CACHE["roots"] = roots
     return roots
 
 
+def invalidate_roots_cache():
+    """Drop cached roots so the next lookup re-checks the directories."""
+    with _ROOTS_LOCK:
+        _ROOTS_CACHE["key"] = None
+        _ROOTS_CACHE["roots"] = None
+
+
+def refresh_roots():
+    """Recompute ROOTS and the allowed root path lookups."""
+    global ROOTS, ROOTS_JSON, ALLOWED_ROOT_PATHS
+    global ALLOWED_ROOT_PATHS_SET, ALLOWED_ROOT_PATHS_WITH_SEP
+    roots = get_roots()
+    if roots is ROOTS:
+        return
+    ROOTS = roots
+    ROOTS_JSON = dump_json_bytes({"roots": ROOTS})
+    ALLOWED_ROOT_PATHS = [root["path"] for root in ROOTS]
+    ALLOWED_ROOT_PATHS_SET = frozenset(ALLOWED_ROOT_PATHS)
+    ALLOWED_ROOT_PATHS_WITH_SEP = tuple(
+        path.rstrip(os.sep) + os.sep for path in ALLOWED_ROOT_PATHS
+    )
+
+
 def get_template_dirs() -> list[dict[str, str]]:
     """Return bundled and user-configured template directories."""
     template_dirs = [
@@ -218,14 +349,19 @@ def validate_template_dirs(paths: list[str]) -> list[str]:
     return validated_dirs
 
 
+# Filename suffixes checked with a single str.endswith call
+SHELL_TEMPLATE_SUFFIXES = (".sh", ".bash", ".sh.j2")
+TEMPLATE_SUFFIXES = SHELL_TEMPLATE_SUFFIXES + (".py", ".R")
+
+
 def is_template_file(filename: str) -> bool:
     """Return True for supported script template filenames."""
-    return filename.endswith((".sh", ".bash", ".sh.j2", ".py", ".R"))
+    return filename.endswith(TEMPLATE_SUFFIXES)
 
 
 def get_template_type(filename: str) -> str:
     """Return a readable template type from the filename."""
-    if filename.endswith((".sh", ".bash", ".sh.j2")):
+    if filename.endswith(SHELL_TEMPLATE_SUFFIXES):
         return "Shell"
     if filename.endswith(".py"):
         return "Python"
@@ -263,6 +399,35 @@ def label_template_files(template_files: list[dict[str, str]]) -> list[dict[str,
 
     return labeled_templates
 
+# Sorted template filenames per directory, keyed on the directory's mtime,
+# which changes whenever files are added, removed, or renamed.
+_TEMPLATE_LIST_CACHE = {}
+_TEMPLATE_LIST_LOCK = threading.Lock()
+
+
+def list_template_names(directory: str, mtime_ns: int) -> list[str]:
+    """Return sorted template filenames in a directory, cached by directory mtime.
+
+    mtime_ns is the caller's st_mtime_ns for the directory.
+    """
+    with _TEMPLATE_LIST_LOCK:
+        cached = _TEMPLATE_LIST_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with os.scandir(directory) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if not entry.name.startswith(".")
+            and is_template_file(entry.name)
+            and entry.is_file()
+        ]
+    names.sort()
+    with _TEMPLATE_LIST_LOCK:
+        _TEMPLATE_LIST_CACHE[directory] = (mtime_ns, names)
+    return names
+
 # ============================================================================
 # Application Initialization
 # ============================================================================
@@ -275,13 +440,78 @@ ALLOWED_NAV_COLORS = [
     ("#f1f3f5", "Light Gray"),
     ("#ede7f6", "Lavender"),
 ]
+ALLOWED_NAV_COLOR_VALUES = frozenset(color[0] for color in ALLOWED_NAV_COLORS)
+DEFAULT_NAV_COLOR = ALLOWED_NAV_COLORS[0][0]
 
-# Initialize roots and allowed paths
-ROOTS = get_roots()
-ALLOWED_ROOT_PATHS = [root["path"] for root in ROOTS]
 
-# Jinja2 environment for template rendering (separate from Flask's template engine)
-jinja_env = Environment(loader=BaseLoader(), undefined=StrictUndefined)
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes API responses with orjson.
+
+    Request bodies are still parsed by DefaultJSONProvider.loads; orjson is
+    stricter than the stdlib parser (lone surrogates, NaN, big integers).
+    """
+
+    def dumps(self, obj, **kwargs):
+        # Formatting kwargs (indent, separators) are ignored; output is compact
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. lone surrogates, which the stdlib encoder escapes
+            return super().dumps(obj, **kwargs)
+
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Response key order doesn't matter to the frontend; skip sorting every dict,
+# and keep responses compact even in debug mode
+app.json.sort_keys = False
+app.json.compact = True
+
+
+def dump_json_bytes(obj):
+    """Serialize obj to a JSON response body with the app's JSON provider."""
+    return (app.json.dumps(obj) + "\n").encode("utf-8")
+
+
+def json_bytes_response(body):
+    """Return a JSON response for an already-serialized body."""
+    return app.response_class(body, mimetype="application/json")
+
+
+# Initialize roots and allowed paths (all kept in sync by refresh_roots)
+ROOTS = None
+# Serialized /api/roots body, rebuilt only when the roots change
+ROOTS_JSON = b""
+ALLOWED_ROOT_PATHS = []
+ALLOWED_ROOT_PATHS_SET = frozenset()
+# Root paths with a trailing separator, for directory-boundary prefix checks
+# (a tuple so str.startswith can test all roots in one call)
+ALLOWED_ROOT_PATHS_WITH_SEP = ()
+refresh_roots()
+
+# Template text being compiled by the current thread, as (name, source). The
+# loader only needs the source on a cache miss, so nothing is kept around.
+_pending_template = threading.local()
+
+
+def load_pending_template(name):
+    """Return the source registered under name by compile_template, if any."""
+    pending = getattr(_pending_template, "value", None)
+    if pending is None or pending[0] != name:
+        return None
+    return pending[1]
+
+
+# Jinja2 environment for template rendering (separate from Flask's template engine).
+# Templates are loaded by content hash so the environment's LRU cache keeps
+# compiled templates across requests. A name's source can never change, so
+# cached templates don't need up-to-date checks.
+jinja_env = Environment(
+    loader=FunctionLoader(load_pending_template),
+    undefined=StrictUndefined,
+    cache_size=400,
+    auto_reload=False,
+)
 
 logger.info(
     "Starting Template Bash Script Editor app; TEMPLATE_DIR=%s, ROOTS=%s",
@@ -294,11 +524,8 @@ logger.info(
 # ============================================================================
 
 
-def is_subpath(path, parent):
-    """Return True if path is inside parent (or equal), compatible with older Python."""
-    path_real = os.path.realpath(path)
-    parent_real = os.path.realpath(parent)
-
+def is_subpath_resolved(path_real, parent_real):
+    """Return True if an already-resolved path is inside parent (or equal)."""
     # Exact match is always allowed
     if path_real == parent_real:
         return True
@@ -308,9 +535,18 @@ def is_subpath(path, parent):
     return path_real.startswith(parent_with_sep)
 
 
-def is_allowed_path(path):
-    """Return True if the path is under any allowed root."""
-    return any(is_subpath(path, root) for root in ALLOWED_ROOT_PATHS)
+def is_allowed_path_resolved(path_real):
+    """Return True if an already-resolved path is under any allowed root."""
+    return (
+        path_real in ALLOWED_ROOT_PATHS_SET
+        or path_real.startswith(ALLOWED_ROOT_PATHS_WITH_SEP)
+    )
+
+
+# Match the opening "{{ variable_name" and capture the first identifier only.
+# Not scanning ahead for the closing braces keeps matching linear in the
+# template length.
+_JINJA_VAR_RE = re.compile(r"{{\s*([a-zA-Z_][a-zA-Z0-9_]*)")
 
 
 def extract_jinja_variables(template_text):
@@ -321,18 +557,89 @@ def extract_jinja_variables(template_text):
     first token inside the braces. It ignores filters and other syntax that may
     follow the variable name, e.g. {{ user | default('friend') }}.
     """
-    # Match {{ variable_name ... }} and capture the first identifier only.
-    pattern = re.compile(r"{{\s*([a-zA-Z_][a-zA-Z0-9_]*)[^}]*}}")
-    vars_found = sorted(set(pattern.findall(template_text)))
-    return vars_found
+    if "{{" not in template_text:
+        return []
+    # Collect into a set as we scan rather than building a list of every match
+    return sorted({match.group(1) for match in _JINJA_VAR_RE.finditer(template_text)})
+
+
+# Template contents and variables keyed on file path; an entry is reused while
+# the file's modification time and size are unchanged (size guards against
+# coarse mtime resolution on network filesystems).
+_TEMPLATE_CACHE = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+# Templates below this size are read with a single os.read() call
+SMALL_TEMPLATE_SIZE = 64 * 1024
+
+
+def read_template(template_path, template_stat):
+    """Return (content, variables) for a template file, cached by modification time.
+
+    template_stat is the caller's os.stat() result for template_path.
+    """
+    key = (template_stat.st_mtime_ns, template_stat.st_size)
+    with _TEMPLATE_LOCK:
+        cached = _TEMPLATE_CACHE.get(template_path)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+
+    # Read raw bytes and decode once, skipping text-mode I/O setup
+    if template_stat.st_size < SMALL_TEMPLATE_SIZE:
+        # Small files: one read() of the known size on a raw descriptor
+        fd = os.open(template_path, os.O_RDONLY)
+        try:
+            data = os.read(fd, template_stat.st_size)
+        finally:
+            os.close(fd)
+    else:
+        data = Path(template_path).read_bytes()
+    content = data.decode("utf-8")
+    if "\r" in content:
+        # Match text-mode universal newlines so CRLF templates render as LF
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    variables = extract_jinja_variables(content)
+    with _TEMPLATE_LOCK:
+        _TEMPLATE_CACHE[template_path] = (key, content, variables)
+    return content, variables
+
+
+def compile_template(template_text):
+    """Compile template text with the shared Jinja2 environment, reusing recent results."""
+    # surrogatepass: JSON payloads can carry lone surrogates, which Jinja accepts
+    source_bytes = template_text.encode("utf-8", "surrogatepass")
+    name = hashlib.blake2b(source_bytes, digest_size=16).hexdigest()
+    _pending_template.value = (name, template_text)
+    try:
+        return jinja_env.get_template(name)
+    finally:
+        _pending_template.value = None
+
+
+def write_text_file(file_path, content):
+    """Write text as UTF-8 straight to a file descriptor, bypassing buffered I/O."""
+    data = memoryview(content.encode("utf-8"))
+    # Same permissions as open(..., "w"): 0o666 filtered by the umask
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
+# Translation table deleting path separators and NUL; a name that changes
+# under it contains one of them.
+_UNSAFE_FILENAME_CHARS = str.maketrans("", "", "/\\\0")
 
 
 def safe_filename(name):
     """Very basic filename validation."""
     if not name or name.strip() == "":
         return False
-    # Disallow path separators and traversal
-    if "/" in name or "\\" in name or ".." in name:
+    # Disallow path separators, NUL bytes, and traversal
+    if name.translate(_UNSAFE_FILENAME_CHARS) != name or ".." in name:
         return False
     return True
 
@@ -343,9 +650,8 @@ def inject_template_vars():
     settings = load_settings()
     navbar_color = settings.get("navbar_color", "#e3f2fd")
     # Validate navbar color is in allowed list
-    allowed_values = [color[0] for color in ALLOWED_NAV_COLORS]
-    if navbar_color not in allowed_values:
-        navbar_color = allowed_values[0]
+    if navbar_color not in ALLOWED_NAV_COLOR_VALUES:
+        navbar_color = DEFAULT_NAV_COLOR
     return {
         "navbar_color": navbar_color,
         "allowed_nav_colors": ALLOWED_NAV_COLORS,
@@ -370,28 +676,52 @@ def settings_page():
 # ============================================================================
 
 
+# Serialized /api/templates body keyed on each template directory's identity
+# and mtime, so the listing is rebuilt only when a directory or setting changes.
+_TEMPLATES_RESPONSE_CACHE = {"key": None, "body": None}
+_TEMPLATES_RESPONSE_LOCK = threading.Lock()
+
+
 @app.route("/api/templates", methods=["GET"])
 def list_templates():
     """Return list of available bash script templates."""
     template_dirs = get_template_dirs()
-    logger.info("Listing templates in %s", [item["path"] for item in template_dirs])
-    template_files = []
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Listing templates in %s", [item["path"] for item in template_dirs])
+
+    cache_key = []
     for source_index, template_dir in enumerate(template_dirs):
-        directory = template_dir["path"]
-        if not os.path.isdir(directory):
+        try:
+            dir_stat = os.stat(template_dir["path"])
+        except OSError:
             continue
-        for entry in sorted(os.listdir(directory)):
-            if entry.startswith("."):
-                continue
-            if not is_template_file(entry):
-                continue
+        if stat.S_ISDIR(dir_stat.st_mode):
+            cache_key.append((
+                source_index,
+                template_dir["label"],
+                template_dir["path"],
+                dir_stat.st_mtime_ns,
+            ))
+    cache_key = tuple(cache_key)
+
+    with _TEMPLATES_RESPONSE_LOCK:
+        if _TEMPLATES_RESPONSE_CACHE["key"] == cache_key:
+            return json_bytes_response(_TEMPLATES_RESPONSE_CACHE["body"])
+
+    template_files = []
+    for source_index, label, directory, mtime_ns in cache_key:
+        for entry in list_template_names(directory, mtime_ns):
             template_files.append({
                 "id": "%s::%s" % (source_index, entry),
                 "name": entry,
-                "source_label": template_dir["label"],
-                "source_path": template_dir["path"],
+                "source_label": label,
+                "source_path": directory,
             })
-    return jsonify({"templates": label_template_files(template_files)})
+    body = dump_json_bytes({"templates": label_template_files(template_files)})
+    with _TEMPLATES_RESPONSE_LOCK:
+        _TEMPLATES_RESPONSE_CACHE["key"] = cache_key
+        _TEMPLATES_RESPONSE_CACHE["body"] = body
+    return json_bytes_response(body)
 
 
 @app.route("/api/template/<name>", methods=["GET"])
@@ -402,7 +732,7 @@ def get_template(name):
         logger.warning("Rejected template id %r (invalid)", name)
         abort(400, description="Invalid template name")
 
-    if "/" in template_name or "\\" in template_name or ".." in template_name:
+    if not safe_filename(template_name):
         logger.warning("Rejected template name %r (invalid)", name)
         abort(400, description="Invalid template name")
 
@@ -411,19 +741,20 @@ def get_template(name):
         abort(404, description="Template source not found")
 
     template_path = os.path.join(template_dirs[source_index]["path"], template_name)
-    logger.info("Loading template %s", template_path)
-    if not os.path.isfile(template_path):
+    logger.debug("Loading template %s", template_path)
+    try:
+        template_stat = os.stat(template_path)
+    except OSError:
+        template_stat = None
+    if template_stat is None or not stat.S_ISREG(template_stat.st_mode):
         abort(404, description="Template not found")
 
     try:
-        # Explicit UTF-8 encoding (Python 3 best practice)
-        with open(template_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content, variables = read_template(template_path, template_stat)
     except OSError:
         logger.exception("Failed to read template file %s", template_path)
         abort(500, description="Failed to read template")
 
-    variables = extract_jinja_variables(content)
     return jsonify({
         "id": name,
         "name": template_name,
@@ -438,11 +769,9 @@ def get_template(name):
 def api_get_roots():
     """Return the roots that can be used in the save dialog."""
     # Refresh roots from settings in case they changed
-    global ROOTS, ALLOWED_ROOT_PATHS
-    ROOTS = get_roots()
-    ALLOWED_ROOT_PATHS = [root["path"] for root in ROOTS]
-    logger.info("Returning configured roots")
-    return jsonify({"roots": ROOTS})
+    refresh_roots()
+    logger.debug("Returning configured roots")
+    return json_bytes_response(ROOTS_JSON)
 
 
 @app.route("/api/settings", methods=["GET"])
@@ -475,11 +804,10 @@ def api_save_settings():
     additional_template_dirs = validate_template_dirs(additional_template_dirs)
     
     # Validate navbar color is in allowed list
-    allowed_values = [color[0] for color in ALLOWED_NAV_COLORS]
-    if navbar_color not in allowed_values:
+    if navbar_color not in ALLOWED_NAV_COLOR_VALUES:
         # Default to first allowed color if invalid
-        logger.warning("Invalid navbar_color '%s', defaulting to '%s'", navbar_color, allowed_values[0])
-        navbar_color = allowed_values[0]
+        logger.warning("Invalid navbar_color '%s', defaulting to '%s'", navbar_color, DEFAULT_NAV_COLOR)
+        navbar_color = DEFAULT_NAV_COLOR
     
     settings = {
         "additional_root": additional_root,
@@ -488,10 +816,10 @@ def api_save_settings():
         "navbar_color": navbar_color,
     }
     if save_settings(settings):
+        invalidate_settings_cache()
+        invalidate_roots_cache()
         # Refresh roots
-        global ROOTS, ALLOWED_ROOT_PATHS
-        ROOTS = get_roots()
-        ALLOWED_ROOT_PATHS = [root["path"] for root in ROOTS]
+        refresh_roots()
         logger.info("Settings saved; additional_root=%s, navbar_color=%s", additional_root, navbar_color)
         return jsonify({"status": "ok", "settings": settings})
     else:
@@ -506,6 +834,8 @@ def api_list_dir():
     Query params:
       - path: absolute path to list; if omitted, defaults to the first root.
     """
+    # Pick up roots added by settings saved in another worker process
+    refresh_roots()
     path = request.args.get("path")
     if not path:
         # default to first root path
@@ -515,8 +845,8 @@ def api_list_dir():
         path = ROOTS[0]["path"]
 
     path_real = os.path.realpath(path)
-    logger.info("Listing directory %s", path_real)
-    if not is_allowed_path(path_real):
+    logger.debug("Listing directory %s", path_real)
+    if not is_allowed_path_resolved(path_real):
         logger.warning("Rejected directory %s (not under allowed roots)", path_real)
         abort(400, description="Path is not under an allowed root")
 
@@ -527,7 +857,7 @@ def api_list_dir():
     # Determine which root this directory belongs to so we can compute a parent
     root_for_path = None
     for root in ROOTS:
-        if is_subpath(path_real, root["path"]):
+        if is_subpath_resolved(path_real, root["path"]):
             root_for_path = root
             break
 
@@ -535,32 +865,42 @@ def api_list_dir():
         logger.warning("No root found for path %s", path_real)
         abort(400, description="Path is not under a known root")
 
-    entries = []
+    # (sort key..., entry) tuples; the key is built once per entry so the sort
+    # compares plain tuples. The name tiebreaker keeps entries unique, so the
+    # entry dicts themselves are never compared.
+    keyed_entries = []
     try:
-        for name in os.listdir(path_real):
-            if name.startswith("."):
-                continue
-            entry_path = os.path.join(path_real, name)
-            entry_type = "dir" if os.path.isdir(entry_path) else "file"
-            entries.append(
-                {
-                    "name": name,
-                    "path": entry_path,
-                    "type": entry_type,
-                }
-            )
+        # scandir reports entry types from the directory listing itself, so
+        # only symlinks need an extra stat to tell directories from files.
+        with os.scandir(path_real) as dir_entries:
+            for dir_entry in dir_entries:
+                name = dir_entry.name
+                if name.startswith("."):
+                    continue
+                is_dir = dir_entry.is_dir()
+                keyed_entries.append((
+                    not is_dir,
+                    name.lower(),
+                    name,
+                    {
+                        "name": name,
+                        "path": dir_entry.path,
+                        "type": "dir" if is_dir else "file",
+                    },
+                ))
     except OSError:
         logger.exception("Failed to list directory %s", path_real)
         abort(500, description="Failed to list directory")
 
     # Sort: directories first, then files, alphabetically
-    entries.sort(key=lambda e: (e["type"] != "dir", e["name"].lower()))
+    keyed_entries.sort()
+    entries = [keyed_entry[-1] for keyed_entry in keyed_entries]
 
     # Compute parent, but don't go above the root
     parent = None
-    if os.path.realpath(path_real) != root_for_path["path"]:
+    if path_real != root_for_path["path"]:
         potential_parent = os.path.dirname(path_real)
-        if is_subpath(potential_parent, root_for_path["path"]):
+        if is_subpath_resolved(potential_parent, root_for_path["path"]):
             parent = potential_parent
 
     return jsonify(
@@ -590,14 +930,27 @@ def api_render():
         logger.warning("Invalid variables payload (not a dict): %r", variables)
         abort(400, description="variables must be an object")
 
+    if not isinstance(template_text, str):
+        logger.warning("Invalid template payload (not a string): %r", type(template_text))
+        abort(400, description="template must be a string")
+
+    if len(template_text) > MAX_RENDER_TEMPLATE_LENGTH:
+        logger.warning("Rejected template for rendering (len=%d)", len(template_text))
+        abort(413, description="Template is too large to render")
+
     try:
-        tmpl = jinja_env.from_string(template_text)
+        tmpl = compile_template(template_text)
         rendered = tmpl.render(**variables)
-        logger.info("Rendered template preview successfully (len=%d)", len(rendered))
+        logger.debug("Rendered template preview successfully (len=%d)", len(rendered))
     except TemplateError as exc:
         logger.exception("Template rendering error")
         abort(400, description="Template rendering error: %s" % exc)
 
+    if len(rendered) > MAX_RENDER_OUTPUT_LENGTH:
+        logger.warning("Rejected rendered output (len=%d)", len(rendered))
+        # The request itself was small, so this is not a 413
+        abort(422, description="Rendered script is too large to save")
+
     return jsonify({"rendered": rendered})
 
 
@@ -620,8 +973,10 @@ def api_save():
         logger.warning("Save request missing directory or filename: %r", data)
         abort(400, description="directory and filename are required")
 
+    # Pick up roots added by settings saved in another worker process
+    refresh_roots()
     directory_real = os.path.realpath(directory)
-    if not is_allowed_path(directory_real):
+    if not is_allowed_path_resolved(directory_real):
         logger.warning("Rejected save directory %s (not under allowed roots: %s)", directory_real, ALLOWED_ROOT_PATHS)
         abort(400, description="Directory is not under an allowed root. Add it via Settings > Additional Root Directory.")
 
@@ -630,19 +985,16 @@ def api_save():
         abort(400, description="Invalid filename")
 
     try:
-        if not os.path.isdir(directory_real):
-            os.makedirs(directory_real)
+        os.makedirs(directory_real, exist_ok=True)
     except OSError:
         logger.exception("Failed to create directory %s", directory_real)
         abort(500, description="Failed to create directory")
 
     file_path = os.path.join(directory_real, filename)
-    logger.info("Saving script to %s", file_path)
+    logger.debug("Saving script to %s", file_path)
 
     try:
-        # Explicit UTF-8 encoding (Python 3 best practice)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        write_text_file(file_path, content)
     except OSError:
         logger.exception("Failed to save file %s", file_path)
         abort(500, description="Failed to save file")
@@ -666,6 +1018,26 @@ def not_found(error):
     return redirect(url_for("index")), 404
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle 413 errors."""
+    logger.warning("413 error: %s", error)
+    # Return JSON for API endpoints so the editor can show the reason
+    if request.path.startswith("/api/"):
+        return jsonify({"error": "Request too large", "description": error.description}), 413
+    return "<h1>Request Too Large</h1><p>%s</p>" % error.description, 413
+
+
+@app.errorhandler(422)
+def unprocessable(error):
+    """Handle 422 errors."""
+    logger.warning("422 error: %s", error)
+    # Return JSON for API endpoints so the editor can show the reason
+    if request.path.startswith("/api/"):
+        return jsonify({"error": "Unprocessable request", "description": error.description}), 422
+    return "<h1>Unprocessable Request</h1><p>%s</p>" % error.description, 422
+
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
@@ -682,4 +1054,10 @@ def internal_error(error):
 # ============================================================================
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Debug mode (reloader and debugger) is opt-in via FLASK_DEBUG=1
+    app.run(
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "5000")),
+        debug=os.environ.get("FLASK_DEBUG") == "1",
+        threaded=True,
+    )